@@ -1,15 +1,49 @@
 import logging
+import ciso8601
+import os
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from atlassian import Confluence
-from typing import List, Dict, Optional
+from typing import Dict, Iterator, List, Optional
+
+from .http_session import build_session
+from .state import load_state, save_state
 
 logger = logging.getLogger(__name__)
 
+# Results requested per CQL search call
+CQL_PAGE_SIZE = 50
+
+# Concurrent CQL search calls once the total result count is known
+MAX_WORKERS = 8
+
+# Headroom subtracted from the watermark in CQL, which reads dates in the
+# Confluence user's profile timezone rather than the container's
+WATERMARK_MARGIN = timedelta(hours=12)
+
+
+def _parse_timestamp(value: Optional[str]) -> Optional[datetime]:
+    """Parse an ISO-8601 timestamp as returned by Confluence, or None if invalid."""
+    if not value:
+        return None
+    try:
+        parsed = ciso8601.parse_datetime(value)
+    except ValueError:
+        return None
+    return parsed if parsed.tzinfo else parsed.astimezone()
+
 
 class ConfluenceCollector:
     """Collects updates from Confluence over the last 24 hours."""
 
-    def __init__(self, url: str, username: str, api_token: str, spaces: Optional[List[str]] = None):
+    def __init__(
+        self,
+        url: str,
+        username: str,
+        api_token: str,
+        spaces: Optional[List[str]] = None,
+        state_dir: Optional[str] = None
+    ):
         """
         Initialize Confluence collector.
 
@@ -18,87 +52,170 @@ class ConfluenceCollector:
             username: Confluence username
             api_token: Confluence API token
             spaces: Optional list of space keys to filter
+            state_dir: Optional directory for state persisted between runs
         """
-        self.confluence = Confluence(url=url, username=username, password=api_token, cloud=True)
+        self._session = build_session()
+        self.confluence = Confluence(url=url, username=username, password=api_token, cloud=True, session=self._session)
         self.spaces = spaces
-        logger.info(f"ConfluenceCollector initialized for {url}")
+        space_filter = ' OR '.join(f'space = "{space}"' for space in spaces) if spaces else ''
+        self._space_clause = f'({space_filter}) AND ' if space_filter else ''
 
-    def get_updated_pages(self) -> List[Dict]:
-        """Get pages updated in the last 24 hours."""
-        try:
-            yesterday = datetime.now() - timedelta(days=1)
-            yesterday_str = yesterday.strftime('%Y-%m-%d')
+        self._watermark_path = os.path.join(state_dir, 'confluence_watermark.json') if state_dir else None
+        watermark_state = load_state(self._watermark_path) if self._watermark_path else {}
+        self._watermark = _parse_timestamp(watermark_state.get('last_high_watermark'))
+        logger.info("ConfluenceCollector initialized for %s", url)
+
+    def close(self):
+        """Close the pooled HTTP session."""
+        self._session.close()
+
+    def commit_watermark(self, pages: List[Dict]):
+        """
+        Advance the high watermark to the newest last_updated timestamp of the given pages.
+
+        Call this only once the pages have been delivered, so a failed digest
+        run reports the same pages again on the next run.
+
+        Args:
+            pages: Pages returned by get_updated_pages
+        """
+        timestamps = [dt for dt in map(_parse_timestamp, (page.get('last_updated') for page in pages)) if dt]
+        newest = max(timestamps, default=None)
+
+        if not newest or (self._watermark and newest <= self._watermark):
+            return
+
+        self._watermark = newest
+        if self._watermark_path:
+            save_state(self._watermark_path, {'last_high_watermark': newest.isoformat()})
+
+    def _search(self, cql: str, start: int, limit: int) -> Dict:
+        """Run one CQL search window with version, space and history expanded."""
+        return self.confluence.cql(
+            cql,
+            start=start,
+            limit=limit,
+            expand='content.version,content.space,content.history.lastUpdated'
+        )
+
+    def _iter_search(self, cql: str) -> Iterator[Dict]:
+        """
+        Run a CQL search and yield all result entries in order.
+
+        The first window is fetched synchronously; its totalSize determines the
+        remaining windows, which are then fetched concurrently and yielded as
+        soon as each one (in offset order) is available. A failed window
+        raises, so the search is never reported as complete with gaps.
+
+        Args:
+            cql: CQL query
 
-            cql = f'lastModified >= "{yesterday_str}"'
+        Yields:
+            Search result entries
+        """
+        first = self._search(cql, 0, CQL_PAGE_SIZE)
+        if not first or 'results' not in first:
+            return
 
-            if self.spaces:
-                space_filter = ' OR '.join([f'space = "{space}"' for space in self.spaces])
-                cql = f'({space_filter}) AND {cql}'
+        yield from first['results']
 
-            cql += ' ORDER BY lastModified DESC'
+        page_size = first.get('limit') or CQL_PAGE_SIZE
+        total = first.get('totalSize', len(first['results']))
+        offsets = list(range(page_size, total, page_size))
 
-            logger.info(f"Fetching updated pages with CQL: {cql}")
+        if not offsets:
+            return
 
-            pages = []
-            start = 0
-            limit = 50
+        with ThreadPoolExecutor(max_workers=min(MAX_WORKERS, len(offsets))) as executor:
+            futures = [executor.submit(self._search, cql, offset, page_size) for offset in offsets]
 
-            while True:
+            for offset, future in zip(offsets, futures):
                 try:
-                    results = self.confluence.cql(cql, start=start, limit=limit)
+                    window = future.result()
+                except Exception:
+                    # Skipping a window would drop its pages from the digest for good
+                    logger.error("CQL search failed at offset %d", offset)
+                    executor.shutdown(wait=False, cancel_futures=True)
+                    raise
 
-                    if not results or 'results' not in results:
-                        break
+                if window and 'results' in window:
+                    yield from window['results']
 
-                    for result in results['results']:
-                        content = result.get('content', {})
-                        page_id = content.get('id')
+    def _page_from_content(self, content: Dict, watermark: Optional[datetime]) -> Optional[Dict]:
+        """
+        Build a page dict from an expanded CQL content entry.
 
-                        if not page_id:
-                            continue
+        Args:
+            content: Content entry of a CQL search result
+            watermark: Pages last updated at or before this time are skipped
 
-                        try:
-                            page_details = self.confluence.get_page_by_id(
-                                page_id,
-                                expand='version,space,history.lastUpdated'
-                            )
+        Returns:
+            Page dict, or None if the entry has no id or is not newer than the watermark
+        """
+        page_id = content.get('id')
+        if not page_id:
+            return None
 
-                            version = page_details.get('version', {})
-                            space = page_details.get('space', {})
-                            history = page_details.get('history', {})
+        version = content.get('version', {})
+        space = content.get('space', {})
+        history = content.get('history', {})
+
+        last_updated_by = version.get('by', {}).get('displayName', 'Unknown')
+        last_updated = history.get('lastUpdated', {}).get('when', version.get('when', ''))
+
+        if watermark:
+            last_updated_dt = _parse_timestamp(last_updated)
+            if last_updated_dt and last_updated_dt <= watermark:
+                return None
+
+        return {
+            'id': page_id,
+            'title': content.get('title'),
+            'space_name': space.get('name'),
+            'space_key': space.get('key'),
+            'url': f"{self.confluence.url}/pages/viewpage.action?pageId={page_id}",
+            'last_updated': last_updated,
+            'last_updated_by': last_updated_by,
+            'version_number': version.get('number')
+        }
+
+    def iter_updated_pages(self) -> Iterator[Dict]:
+        """
+        Yield pages updated since the previous run as they are fetched.
 
-                            last_updated_by = version.get('by', {}).get('displayName', 'Unknown')
-                            last_updated = history.get('lastUpdated', {}).get('when', version.get('when', ''))
+        The first run (no stored watermark) covers the last 24 hours. Later runs
+        only query pages modified after the watermark stored by commit_watermark.
+        Unlike get_updated_pages, errors are raised to the caller.
+        """
+        watermark = self._watermark
 
-                            pages.append({
-                                'id': page_id,
-                                'title': page_details.get('title'),
-                                'space_name': space.get('name'),
-                                'space_key': space.get('key'),
-                                'url': f"{self.confluence.url}/pages/viewpage.action?pageId={page_id}",
-                                'last_updated': last_updated,
-                                'last_updated_by': last_updated_by,
-                                'version_number': version.get('number')
-                            })
+        if watermark:
+            # CQL dates have minute precision and use the user's timezone; pages
+            # at or before the watermark are dropped after the search
+            since_str = (watermark - WATERMARK_MARGIN).astimezone().strftime('%Y-%m-%d %H:%M')
+        else:
+            yesterday = datetime.now() - timedelta(days=1)
+            since_str = yesterday.strftime('%Y-%m-%d')
 
-                        except Exception as page_error:
-                            logger.warning(f"Could not fetch details for page {page_id}: {page_error}")
-                            continue
+        cql = f'{self._space_clause}lastModified >= "{since_str}" ORDER BY lastModified DESC'
 
-                    if len(results['results']) < limit:
-                        break
+        logger.info("Fetching updated pages with CQL: %s", cql)
 
-                    start += limit
+        for result in self._iter_search(cql):
+            page = self._page_from_content(result.get('content', {}), watermark)
+            if page:
+                yield page
 
-                except Exception as search_error:
-                    logger.error(f"Error during CQL search: {search_error}")
-                    break
+    def get_updated_pages(self) -> List[Dict]:
+        """Get pages updated since the previous run (see iter_updated_pages)."""
+        try:
+            pages = list(self.iter_updated_pages())
 
-            logger.info(f"Found {len(pages)} updated pages")
+            logger.info("Found %d updated pages", len(pages))
             return pages
 
         except Exception as e:
-            logger.error(f"Error fetching updated pages: {e}")
+            logger.error("Error fetching updated pages: %s", e)
             return []
 
     def get_page_details(self, page_id: str) -> Optional[Dict]:
@@ -125,7 +242,7 @@ class ConfluenceCollector:
             }
 
         except Exception as e:
-            logger.error(f"Error fetching page details for {page_id}: {e}")
+            logger.error("Error fetching page details for %s: %s", page_id, e)
             return None
 
     def collect_all_updates(self) -> List[Dict]:
@@ -134,5 +251,5 @@ class ConfluenceCollector:
 
         pages = self.get_updated_pages()
 
-        logger.info(f"Total Confluence updates collected: {len(pages)}")
+        logger.info("Total Confluence updates collected: %d", len(pages))
         return pages
@@ -0,0 +1,56 @@
+import orjson
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Pooled connections per host; covers the concurrent collector requests
+POOL_SIZE = 32
+
+
+def _orjson_response_hook(response: requests.Response, *args, **kwargs) -> requests.Response:
+    """
+    Decode JSON response bodies with orjson instead of the stdlib json module.
+
+    Calls passing json keyword arguments (e.g. object_hook), which orjson does
+    not support, fall back to the regular Response.json.
+    """
+    stdlib_json = response.json
+
+    def json(**json_kwargs):
+        if json_kwargs:
+            return stdlib_json(**json_kwargs)
+        # orjson.JSONDecodeError subclasses ValueError like json.JSONDecodeError
+        return orjson.loads(response.content)
+
+    response.json = json
+    return response
+
+
+def build_session() -> requests.Session:
+    """
+    Build a requests session with a keep-alive connection pool and retries.
+
+    Reusing pooled connections avoids a TCP/TLS handshake per REST call.
+    Transient errors (429, 5xx) are retried with exponential backoff, and
+    JSON responses are decoded with orjson.
+
+    Returns:
+        Configured requests session
+    """
+    session = requests.Session()
+
+    adapter = HTTPAdapter(
+        pool_connections=POOL_SIZE,
+        pool_maxsize=POOL_SIZE,
+        max_retries=Retry(
+            total=3,
+            backoff_factor=0.5,
+            status_forcelist=[429, 500, 502, 503, 504],
+            raise_on_status=False
+        )
+    )
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    session.hooks['response'].append(_orjson_response_hook)
+
+    return session
@@ -1,10 +1,56 @@
 import logging
-from datetime import datetime, timedelta
+import ciso8601
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
 from atlassian import Jira
-from typing import Dict, List, Optional
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from .http_session import build_session
 
 logger = logging.getLogger(__name__)
 
+# Issues requested per JQL search call (Jira Cloud caps maxResults at 100)
+JQL_PAGE_SIZE = 100
+
+# Upper bound on issues collected per JQL query
+JQL_MAX_ISSUES = 1000
+
+
+def _filter_histories(histories: List[Dict], cutoff: datetime, fields: Tuple[str, ...]) -> Dict[str, List[Dict]]:
+    """
+    Collect changelog items of the given fields that were made after cutoff.
+
+    Kept as a plain function over built-in dicts and lists so the innermost
+    loop does no collector attribute lookups and parses each history
+    timestamp once.
+
+    Args:
+        histories: Changelog histories of one issue
+        cutoff: Aware datetime; older histories are skipped
+        fields: Changelog field names to collect (e.g. 'status', 'assignee')
+
+    Returns:
+        Dictionary mapping each field to a list of {'from', 'to', 'when'} dicts
+    """
+    parse = ciso8601.parse_datetime
+    changes = {field: [] for field in fields}
+
+    for history in histories:
+        created = history.get('created')
+        if parse(created) <= cutoff:
+            continue
+
+        for item in history.get('items', ()):
+            bucket = changes.get(item.get('field'))
+            if bucket is not None:
+                bucket.append({
+                    'from': item.get('fromString'),
+                    'to': item.get('toString'),
+                    'when': created
+                })
+
+    return changes
+
 
 class JiraCollector:
     """Collects updates from Jira over the last 24 hours."""
@@ -19,207 +65,291 @@ class JiraCollector:
             api_token: Jira API token
             projects: Optional list of project keys to filter
         """
-        self.jira = Jira(url=url, username=username, password=api_token, cloud=True)
+        self._session = build_session()
+        self.jira = Jira(url=url, username=username, password=api_token, cloud=True, session=self._session)
         self.projects = projects
-        logger.info(f"JiraCollector initialized for {url}")
 
-    def _build_project_filter(self) -> str:
-        """Build JQL project filter."""
-        if self.projects:
-            project_list = ','.join(self.projects)
-            return f"project in ({project_list})"
-        return ""
+        # JQL is relative (-1d), so the full queries can be built once
+        project_clause = f"project in ({','.join(projects)}) AND " if projects else ""
+        self._new_tickets_jql = f"{project_clause}created >= -1d ORDER BY created DESC"
+        self._changes_jql = f"{project_clause}updated >= -1d ORDER BY updated DESC"
+        logger.info("JiraCollector initialized for %s", url)
 
-    def get_new_tickets(self) -> List[Dict]:
-        """Get tickets created in the last 24 hours."""
-        try:
-            project_filter = self._build_project_filter()
-            jql = f"{project_filter + ' AND ' if project_filter else ''}created >= -1d ORDER BY created DESC"
-
-            logger.info(f"Fetching new tickets with JQL: {jql}")
-            issues = self.jira.jql(jql, limit=1000)
-
-            tickets = []
-            for issue in issues.get('issues', []):
-                fields = issue.get('fields', {})
-                tickets.append({
-                    'key': issue.get('key'),
-                    'summary': fields.get('summary'),
-                    'status': fields.get('status', {}).get('name'),
-                    'assignee': fields.get('assignee', {}).get('displayName', 'Unassigned') if fields.get('assignee') else 'Unassigned',
-                    'created': fields.get('created'),
-                    'project': fields.get('project', {}).get('name'),
-                    'project_key': fields.get('project', {}).get('key'),
-                    'url': f"{self.jira.url}/browse/{issue.get('key')}",
-                    'type': fields.get('issuetype', {}).get('name')
-                })
+    def close(self):
+        """Close the pooled HTTP session."""
+        self._session.close()
 
-            logger.info(f"Found {len(tickets)} new tickets")
-            return tickets
+    def _iter_issues(self, jql: str, **kwargs) -> Iterator[Dict]:
+        """
+        Run a JQL search and yield its issues page by page.
 
-        except Exception as e:
-            logger.error(f"Error fetching new tickets: {e}")
-            return []
+        Requests JQL_PAGE_SIZE issues per call. If the server caps maxResults
+        below that, the server-reported page size is used for the following calls.
+        Only one page of raw issues is held in memory at a time.
+
+        Args:
+            jql: JQL query
+            **kwargs: Additional arguments for Jira.jql (fields, expand)
+
+        Yields:
+            At most JQL_MAX_ISSUES issues
+        """
+        start = 0
+        page_size = JQL_PAGE_SIZE
+
+        while start < JQL_MAX_ISSUES:
+            response = self.jira.jql(jql, start=start, limit=page_size, **kwargs)
+            page = response.get('issues', [])
+            yield from page[:JQL_MAX_ISSUES - start]
+
+            page_size = min(response.get('maxResults') or page_size, JQL_PAGE_SIZE)
+            start += len(page)
+
+            if not page or start >= response.get('total', 0):
+                break
+
+    def _histories(self, issue: Dict) -> List[Dict]:
+        """
+        Return the changelog histories of an issue from a search result.
+
+        Search results inline at most 100 histories per issue. Only for issues
+        whose inline changelog is truncated, the full changelog is fetched
+        through the paged changelog endpoint. The inline histories are kept
+        if that endpoint returns nothing.
+        """
+        changelog = issue.get('changelog', {})
+        histories = changelog.get('histories', [])
+
+        if changelog.get('total', 0) <= len(histories):
+            return histories
 
-    def get_status_changes(self) -> List[Dict]:
-        """Get tickets with status changes in the last 24 hours."""
         try:
-            project_filter = self._build_project_filter()
-            jql = f"{project_filter + ' AND ' if project_filter else ''}status changed AFTER -1d ORDER BY updated DESC"
-
-            logger.info(f"Fetching status changes with JQL: {jql}")
-            issues = self.jira.jql(jql, limit=1000)
-
-            tickets = []
-            for issue in issues.get('issues', []):
-                fields = issue.get('fields', {})
-
-                changelog = self.jira.get_issue_changelog(issue.get('key'))
-                status_changes = []
-
-                for history in changelog.get('values', []):
-                    created = history.get('created')
-                    created_dt = datetime.fromisoformat(created.replace('Z', '+00:00'))
-
-                    if created_dt > datetime.now(created_dt.tzinfo) - timedelta(days=1):
-                        for item in history.get('items', []):
-                            if item.get('field') == 'status':
-                                status_changes.append({
-                                    'from': item.get('fromString'),
-                                    'to': item.get('toString'),
-                                    'when': created
-                                })
-
-                if status_changes:
-                    tickets.append({
-                        'key': issue.get('key'),
-                        'summary': fields.get('summary'),
-                        'current_status': fields.get('status', {}).get('name'),
-                        'assignee': fields.get('assignee', {}).get('displayName', 'Unassigned') if fields.get('assignee') else 'Unassigned',
-                        'project': fields.get('project', {}).get('name'),
-                        'project_key': fields.get('project', {}).get('key'),
-                        'url': f"{self.jira.url}/browse/{issue.get('key')}",
-                        'status_changes': status_changes
-                    })
-
-            logger.info(f"Found {len(tickets)} tickets with status changes")
-            return tickets
+            full_histories = []
+            start = 0
+            path = f"rest/api/2/issue/{issue.get('key')}/changelog"
 
-        except Exception as e:
-            logger.error(f"Error fetching status changes: {e}")
-            return []
+            # Jira.get_issue_changelog ignores start/limit in the pinned library
+            # version and returns the truncated inline changelog instead
+            while True:
+                response = self.jira.get(path, params={'startAt': start, 'maxResults': JQL_PAGE_SIZE}) or {}
+                values = response.get('values', [])
+                full_histories.extend(values)
+                start += len(values)
 
-    def get_assignment_changes(self) -> List[Dict]:
-        """Get tickets with assignee changes in the last 24 hours."""
+                if not values or response.get('isLast', True):
+                    break
+
+            return full_histories or histories
+
+        except Exception as changelog_error:
+            logger.warning("Could not fetch full changelog for %s: %s", issue.get('key'), changelog_error)
+            return histories
+
+    def iter_new_tickets(self) -> Iterator[Dict]:
+        """
+        Yield tickets created in the last 24 hours as they are fetched.
+
+        Unlike get_new_tickets, errors are raised to the caller.
+        """
+        jql = self._new_tickets_jql
+
+        logger.info("Fetching new tickets with JQL: %s", jql)
+        issues = self._iter_issues(
+            jql,
+            fields='summary,status,assignee,project,issuetype,created'
+        )
+
+        browse_url = f"{self.jira.url}/browse/"
+
+        for issue in issues:
+            key = issue.get('key')
+            fields = issue.get('fields', {})
+            project = fields.get('project') or {}
+
+            yield {
+                'key': key,
+                'summary': fields.get('summary'),
+                'status': (fields.get('status') or {}).get('name'),
+                'assignee': (fields.get('assignee') or {}).get('displayName', 'Unassigned'),
+                'created': fields.get('created'),
+                'project': project.get('name'),
+                'project_key': project.get('key'),
+                'url': browse_url + key,
+                'type': (fields.get('issuetype') or {}).get('name')
+            }
+
+    def get_new_tickets(self) -> List[Dict]:
+        """Get tickets created in the last 24 hours."""
         try:
-            project_filter = self._build_project_filter()
-            jql = f"{project_filter + ' AND ' if project_filter else ''}assignee changed AFTER -1d ORDER BY updated DESC"
-
-            logger.info(f"Fetching assignment changes with JQL: {jql}")
-            issues = self.jira.jql(jql, limit=1000)
-
-            tickets = []
-            for issue in issues.get('issues', []):
-                fields = issue.get('fields', {})
-
-                changelog = self.jira.get_issue_changelog(issue.get('key'))
-                assignment_changes = []
-
-                for history in changelog.get('values', []):
-                    created = history.get('created')
-                    created_dt = datetime.fromisoformat(created.replace('Z', '+00:00'))
-
-                    if created_dt > datetime.now(created_dt.tzinfo) - timedelta(days=1):
-                        for item in history.get('items', []):
-                            if item.get('field') == 'assignee':
-                                assignment_changes.append({
-                                    'from': item.get('fromString') or 'Unassigned',
-                                    'to': item.get('toString') or 'Unassigned',
-                                    'when': created
-                                })
-
-                if assignment_changes:
-                    tickets.append({
-                        'key': issue.get('key'),
-                        'summary': fields.get('summary'),
-                        'status': fields.get('status', {}).get('name'),
-                        'current_assignee': fields.get('assignee', {}).get('displayName', 'Unassigned') if fields.get('assignee') else 'Unassigned',
-                        'project': fields.get('project', {}).get('name'),
-                        'project_key': fields.get('project', {}).get('key'),
-                        'url': f"{self.jira.url}/browse/{issue.get('key')}",
-                        'assignment_changes': assignment_changes
-                    })
-
-            logger.info(f"Found {len(tickets)} tickets with assignment changes")
+            tickets = list(self.iter_new_tickets())
+
+            logger.info("Found %d new tickets", len(tickets))
             return tickets
 
         except Exception as e:
-            logger.error(f"Error fetching assignment changes: {e}")
+            logger.error("Error fetching new tickets: %s", e)
             return []
 
-    def get_new_comments(self) -> List[Dict]:
-        """Get tickets with new comments in the last 24 hours."""
+    def _collect_changes_bundle(self) -> Dict[str, List[Dict]]:
+        """
+        Collect status changes, assignment changes and new comments in one pass.
+
+        A single JQL search over all recently updated issues returns the
+        changelog (expand=changelog) and the comments (fields=comment) inline,
+        so no per-issue follow-up requests are needed.
+
+        Returns:
+            Dictionary with 'status_changes', 'assignment_changes' and 'new_comments' lists
+        """
+        bundle = {
+            'status_changes': [],
+            'assignment_changes': [],
+            'new_comments': []
+        }
+
         try:
-            project_filter = self._build_project_filter()
-            jql = f"{project_filter + ' AND ' if project_filter else ''}updated >= -1d ORDER BY updated DESC"
+            jql = self._changes_jql
 
-            logger.info(f"Fetching tickets with potential new comments with JQL: {jql}")
-            issues = self.jira.jql(jql, limit=1000)
+            logger.info("Fetching changelogs and comments with JQL: %s", jql)
+            issues = self._iter_issues(
+                jql,
+                expand='changelog',
+                fields='summary,status,assignee,project,comment'
+            )
 
-            tickets = []
-            for issue in issues.get('issues', []):
-                fields = issue.get('fields', {})
+            cutoff = datetime.now(timezone.utc) - timedelta(days=1)
+            browse_url = f"{self.jira.url}/browse/"
 
+            for issue in issues:
                 try:
-                    comments_data = self.jira.issue_get_comments(issue.get('key'))
-                    comments = comments_data.get('comments', [])
+                    fields = issue.get('fields', {})
+
+                    changes = _filter_histories(
+                        self._histories(issue),
+                        cutoff,
+                        ('status', 'assignee')
+                    )
+                    status_changes = changes['status']
+                    assignment_changes = [
+                        {
+                            'from': change['from'] or 'Unassigned',
+                            'to': change['to'] or 'Unassigned',
+                            'when': change['when']
+                        }
+                        for change in changes['assignee']
+                    ]
 
                     recent_comments = []
-                    for comment in comments:
+                    for comment in (fields.get('comment') or {}).get('comments', []):
                         created = comment.get('created')
-                        created_dt = datetime.fromisoformat(created.replace('Z', '+00:00'))
-
-                        if created_dt > datetime.now(created_dt.tzinfo) - timedelta(days=1):
+                        if ciso8601.parse_datetime(created) > cutoff:
                             recent_comments.append({
-                                'author': comment.get('author', {}).get('displayName', 'Unknown'),
+                                'author': (comment.get('author') or {}).get('displayName', 'Unknown'),
                                 'body': comment.get('body', '')[:200],
                                 'created': created
                             })
 
+                    if not (status_changes or assignment_changes or recent_comments):
+                        continue
+
+                    key = issue.get('key')
+                    summary = fields.get('summary')
+                    status = (fields.get('status') or {}).get('name')
+                    assignee = (fields.get('assignee') or {}).get('displayName', 'Unassigned')
+                    project = fields.get('project') or {}
+                    project_name = project.get('name')
+                    project_key = project.get('key')
+                    url = browse_url + key
+
+                    if status_changes:
+                        bundle['status_changes'].append({
+                            'key': key,
+                            'summary': summary,
+                            'current_status': status,
+                            'assignee': assignee,
+                            'project': project_name,
+                            'project_key': project_key,
+                            'url': url,
+                            'status_changes': status_changes
+                        })
+
+                    if assignment_changes:
+                        bundle['assignment_changes'].append({
+                            'key': key,
+                            'summary': summary,
+                            'status': status,
+                            'current_assignee': assignee,
+                            'project': project_name,
+                            'project_key': project_key,
+                            'url': url,
+                            'assignment_changes': assignment_changes
+                        })
+
                     if recent_comments:
-                        tickets.append({
-                            'key': issue.get('key'),
-                            'summary': fields.get('summary'),
-                            'status': fields.get('status', {}).get('name'),
-                            'assignee': fields.get('assignee', {}).get('displayName', 'Unassigned') if fields.get('assignee') else 'Unassigned',
-                            'project': fields.get('project', {}).get('name'),
-                            'project_key': fields.get('project', {}).get('key'),
-                            'url': f"{self.jira.url}/browse/{issue.get('key')}",
+                        bundle['new_comments'].append({
+                            'key': key,
+                            'summary': summary,
+                            'status': status,
+                            'assignee': assignee,
+                            'project': project_name,
+                            'project_key': project_key,
+                            'url': url,
                             'comments': recent_comments
                         })
-                except Exception as comment_error:
-                    logger.warning(f"Could not fetch comments for {issue.get('key')}: {comment_error}")
+                except Exception as issue_error:
+                    logger.warning("Could not collect changes for %s: %s", issue.get('key'), issue_error)
                     continue
 
-            logger.info(f"Found {len(tickets)} tickets with new comments")
-            return tickets
+            logger.info("Found %d tickets with status changes", len(bundle['status_changes']))
+            logger.info("Found %d tickets with assignment changes", len(bundle['assignment_changes']))
+            logger.info("Found %d tickets with new comments", len(bundle['new_comments']))
+            return bundle
 
         except Exception as e:
-            logger.error(f"Error fetching new comments: {e}")
-            return []
+            logger.error("Error fetching changelogs and comments: %s", e)
+            return {key: [] for key in bundle}
+
+    def get_status_changes(self) -> List[Dict]:
+        """
+        Get tickets with status changes in the last 24 hours.
+
+        Each call runs the full changes search; use collect_all_updates to get
+        status changes, assignment changes and new comments from a single search.
+        """
+        return self._collect_changes_bundle()['status_changes']
+
+    def get_assignment_changes(self) -> List[Dict]:
+        """
+        Get tickets with assignee changes in the last 24 hours.
+
+        Each call runs the full changes search; use collect_all_updates to get
+        status changes, assignment changes and new comments from a single search.
+        """
+        return self._collect_changes_bundle()['assignment_changes']
+
+    def get_new_comments(self) -> List[Dict]:
+        """
+        Get tickets with new comments in the last 24 hours.
+
+        Each call runs the full changes search; use collect_all_updates to get
+        status changes, assignment changes and new comments from a single search.
+        """
+        return self._collect_changes_bundle()['new_comments']
 
     def collect_all_updates(self) -> Dict:
         """Collect all Jira updates from the last 24 hours."""
         logger.info("Collecting all Jira updates")
 
-        updates = {
-            'new_tickets': self.get_new_tickets(),
-            'status_changes': self.get_status_changes(),
-            'assignment_changes': self.get_assignment_changes(),
-            'new_comments': self.get_new_comments()
-        }
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            new_tickets_future = executor.submit(self.get_new_tickets)
+            changes_future = executor.submit(self._collect_changes_bundle)
+
+            updates = {
+                'new_tickets': new_tickets_future.result(),
+                **changes_future.result()
+            }
 
-        total_updates = sum(len(v) for v in updates.values())
-        logger.info(f"Total Jira updates collected: {total_updates}")
+        total_updates = sum(map(len, updates.values()))
+        logger.info("Total Jira updates collected: %d", total_updates)
 
         return updates
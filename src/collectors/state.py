@@ -0,0 +1,47 @@
+import json
+import logging
+import os
+import tempfile
+from typing import Dict
+
+logger = logging.getLogger(__name__)
+
+
+def load_state(path: str) -> Dict:
+    """
+    Load a JSON state file persisted between digest runs.
+
+    Args:
+        path: Path of the state file
+
+    Returns:
+        Stored dictionary, or an empty dictionary if the file is missing or unreadable
+    """
+    try:
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+    except (OSError, ValueError) as e:
+        logger.warning("Could not read state file %s: %s", path, e)
+        return {}
+
+
+def save_state(path: str, state: Dict):
+    """
+    Atomically write a JSON state file.
+
+    Args:
+        path: Path of the state file
+        state: Dictionary to persist
+    """
+    directory = os.path.dirname(path) or '.'
+
+    try:
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(state, f)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        logger.warning("Could not write state file %s: %s", path, e)
@@ -35,6 +35,9 @@ class Config:
     SCHEDULE_TIME = os.getenv('SCHEDULE_TIME', '07:00')
     TIMEZONE = os.getenv('TIMEZONE', 'Europe/Berlin')
 
+    # Directory for state persisted between digest runs
+    STATE_DIR = os.getenv('STATE_DIR', './logs')
+
     # Optional Filters
     JIRA_PROJECTS = [p.strip() for p in os.getenv('JIRA_PROJECTS', '').split(',') if p.strip()]
     CONFLUENCE_SPACES = [s.strip() for s in os.getenv('CONFLUENCE_SPACES', '').split(',') if s.strip()]
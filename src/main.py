@@ -1,13 +1,15 @@
 import logging
 import signal
 import sys
-from apscheduler.schedulers.blocking import BlockingScheduler
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from apscheduler.schedulers.background import BackgroundScheduler
 from apscheduler.triggers.cron import CronTrigger
 
 from config import config
 from collectors.jira_collector import JiraCollector
 from collectors.confluence_collector import ConfluenceCollector
-from reporters.email_builder import EmailBuilder
+from reporters.email_builder import get_email_builder
 from reporters.email_sender import EmailSender
 
 logging.basicConfig(
@@ -41,10 +43,11 @@ class DigestApp:
             url=config.CONFLUENCE_URL,
             username=config.CONFLUENCE_USERNAME,
             api_token=config.CONFLUENCE_API_TOKEN,
-            spaces=config.CONFLUENCE_SPACES if config.CONFLUENCE_SPACES else None
+            spaces=config.CONFLUENCE_SPACES if config.CONFLUENCE_SPACES else None,
+            state_dir=config.STATE_DIR
         )
 
-        self.email_builder = EmailBuilder()
+        self.email_builder = get_email_builder()
 
         self.email_sender = EmailSender(
             smtp_host=config.SMTP_HOST,
@@ -54,7 +57,8 @@ class DigestApp:
             recipient=config.RECIPIENT_EMAIL
         )
 
-        self.scheduler = BlockingScheduler(timezone=config.TIMEZONE)
+        self.scheduler = BackgroundScheduler(timezone=config.TIMEZONE)
+        self.shutdown_event = threading.Event()
 
         logger.info("Application initialized successfully")
 
@@ -65,15 +69,16 @@ class DigestApp:
         logger.info("=" * 80)
 
         try:
-            logger.info("Step 1: Collecting Jira updates")
-            jira_updates = self.jira_collector.collect_all_updates()
+            logger.info("Step 1+2: Collecting Jira and Confluence updates")
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                jira_future = executor.submit(self.jira_collector.collect_all_updates)
+                confluence_future = executor.submit(self.confluence_collector.collect_all_updates)
 
-            logger.info("Step 2: Collecting Confluence updates")
-            confluence_pages = self.confluence_collector.collect_all_updates()
+                jira_updates = jira_future.result()
+                confluence_pages = confluence_future.result()
 
             logger.info("Step 3: Building email content")
-            html_content = self.email_builder.build_digest(jira_updates, confluence_pages)
-            plain_text_content = self.email_builder.build_plain_text_fallback(jira_updates, confluence_pages)
+            html_content, plain_text_content = self.email_builder.build_both(jira_updates, confluence_pages)
 
             logger.info("Step 4: Sending email")
             subject = f"Daily Digest - Jira & Confluence Updates"
@@ -85,6 +90,7 @@ class DigestApp:
             )
 
             if success:
+                self.confluence_collector.commit_watermark(confluence_pages)
                 logger.info("✅ Daily digest job completed successfully")
             else:
                 logger.error("❌ Daily digest job failed: Email could not be sent")
@@ -115,22 +121,28 @@ class DigestApp:
 
         def signal_handler(signum, frame):
             logger.info("Received shutdown signal, stopping scheduler...")
-            self.scheduler.shutdown()
-            sys.exit(0)
+            self.shutdown_event.set()
 
         signal.signal(signal.SIGINT, signal_handler)
         signal.signal(signal.SIGTERM, signal_handler)
 
         logger.info("Starting scheduler (press Ctrl+C to exit)")
+        self.scheduler.start()
+
         # Log next run time if jobs exist
         jobs = self.scheduler.get_jobs()
         if jobs:
             logger.info(f"Scheduled job: {jobs[0]}")
 
-        try:
-            self.scheduler.start()
-        except (KeyboardInterrupt, SystemExit):
-            logger.info("Scheduler stopped")
+        # The scheduler runs in a background thread; the main thread just
+        # sleeps until a shutdown signal arrives
+        self.shutdown_event.wait()
+
+        self.scheduler.shutdown()
+        self.jira_collector.close()
+        self.confluence_collector.close()
+        self.email_sender.close()
+        logger.info("Scheduler stopped")
 
 
 def main():
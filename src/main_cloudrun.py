@@ -1,12 +1,15 @@
+import atexit
 import logging
 import sys
 import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from flask import Flask, request, jsonify
 
 from config import config
 from collectors.jira_collector import JiraCollector
 from collectors.confluence_collector import ConfluenceCollector
-from reporters.email_builder import EmailBuilder
+from reporters.email_builder import get_email_builder
 from reporters.email_sender import EmailSender
 
 logging.basicConfig(
@@ -19,48 +22,81 @@ logger = logging.getLogger(__name__)
 app = Flask(__name__)
 
 
-def run_digest_job():
-    """Main job that collects and sends the digest email."""
-    logger.info("=" * 80)
-    logger.info("Starting daily digest job")
-    logger.info("=" * 80)
+_components = None
+_components_lock = threading.Lock()
 
-    try:
-        config.validate()
 
-        jira_collector = JiraCollector(
-            url=config.JIRA_URL,
-            username=config.JIRA_USERNAME,
-            api_token=config.JIRA_API_TOKEN,
-            projects=config.JIRA_PROJECTS if config.JIRA_PROJECTS else None
-        )
+def get_components():
+    """
+    Return the collectors, builder and sender, creating them on first use.
 
-        confluence_collector = ConfluenceCollector(
-            url=config.CONFLUENCE_URL,
-            username=config.CONFLUENCE_USERNAME,
-            api_token=config.CONFLUENCE_API_TOKEN,
-            spaces=config.CONFLUENCE_SPACES if config.CONFLUENCE_SPACES else None
-        )
+    The instances are kept at module scope so warm Cloud Run instances reuse
+    the validated configuration and the pooled HTTP sessions across requests.
+    """
+    global _components
 
-        email_builder = EmailBuilder()
+    with _components_lock:
+        if _components is None:
+            config.validate()
 
-        email_sender = EmailSender(
-            smtp_host=config.SMTP_HOST,
-            smtp_port=config.SMTP_PORT,
-            username=config.SMTP_USERNAME,
-            password=config.SMTP_PASSWORD,
-            recipient=config.RECIPIENT_EMAIL
-        )
+            jira_collector = JiraCollector(
+                url=config.JIRA_URL,
+                username=config.JIRA_USERNAME,
+                api_token=config.JIRA_API_TOKEN,
+                projects=config.JIRA_PROJECTS if config.JIRA_PROJECTS else None
+            )
+
+            confluence_collector = ConfluenceCollector(
+                url=config.CONFLUENCE_URL,
+                username=config.CONFLUENCE_USERNAME,
+                api_token=config.CONFLUENCE_API_TOKEN,
+                spaces=config.CONFLUENCE_SPACES if config.CONFLUENCE_SPACES else None,
+                state_dir=config.STATE_DIR
+            )
+
+            email_builder = get_email_builder()
+
+            email_sender = EmailSender(
+                smtp_host=config.SMTP_HOST,
+                smtp_port=config.SMTP_PORT,
+                username=config.SMTP_USERNAME,
+                password=config.SMTP_PASSWORD,
+                recipient=config.RECIPIENT_EMAIL
+            )
+
+            _components = (jira_collector, confluence_collector, email_builder, email_sender)
+            logger.info("Digest components initialized")
+
+        return _components
 
-        logger.info("Step 1: Collecting Jira updates")
-        jira_updates = jira_collector.collect_all_updates()
 
-        logger.info("Step 2: Collecting Confluence updates")
-        confluence_pages = confluence_collector.collect_all_updates()
+@atexit.register
+def close_components():
+    """Close the pooled HTTP sessions and the SMTP connection on shutdown."""
+    if _components is not None:
+        jira_collector, confluence_collector, _, email_sender = _components
+        jira_collector.close()
+        confluence_collector.close()
+        email_sender.close()
+
+
+def run_digest_job(jira_collector, confluence_collector, email_builder, email_sender):
+    """Main job that collects and sends the digest email."""
+    logger.info("=" * 80)
+    logger.info("Starting daily digest job")
+    logger.info("=" * 80)
+
+    try:
+        logger.info("Step 1+2: Collecting Jira and Confluence updates")
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            jira_future = executor.submit(jira_collector.collect_all_updates)
+            confluence_future = executor.submit(confluence_collector.collect_all_updates)
+
+            jira_updates = jira_future.result()
+            confluence_pages = confluence_future.result()
 
         logger.info("Step 3: Building email content")
-        html_content = email_builder.build_digest(jira_updates, confluence_pages)
-        plain_text_content = email_builder.build_plain_text_fallback(jira_updates, confluence_pages)
+        html_content, plain_text_content = email_builder.build_both(jira_updates, confluence_pages)
 
         logger.info("Step 4: Sending email")
         subject = f"Daily Digest - Jira & Confluence Updates"
@@ -72,6 +108,7 @@ def run_digest_job():
         )
 
         if success:
+            confluence_collector.commit_watermark(confluence_pages)
             logger.info("✅ Daily digest job completed successfully")
             return {"status": "success", "message": "Email sent successfully"}
         else:
@@ -91,7 +128,13 @@ def trigger_digest():
     """HTTP endpoint to trigger the digest job (called by Cloud Scheduler)."""
     logger.info("Digest job triggered via HTTP endpoint")
 
-    result = run_digest_job()
+    try:
+        components = get_components()
+    except Exception as e:
+        logger.error(f"❌ Could not initialize digest components: {e}", exc_info=True)
+        return jsonify({"status": "error", "message": str(e)}), 500
+
+    result = run_digest_job(*components)
 
     if result["status"] == "success":
         return jsonify(result), 200
@@ -1,11 +1,16 @@
+import functools
+import io
 import logging
 import os
 from datetime import datetime
 from jinja2 import Environment, FileSystemLoader, select_autoescape
-from typing import Dict, List
+from typing import Dict, List, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
+# Digests with more entries than this are streamed into a buffer when rendered as plain text
+LARGE_DIGEST_ITEMS = 500
+
 
 class EmailBuilder:
     """Builds HTML email content from Jira and Confluence data."""
@@ -16,29 +21,54 @@ class EmailBuilder:
 
         self.env = Environment(
             loader=FileSystemLoader(template_dir),
-            autoescape=select_autoescape(['html', 'xml'])
+            autoescape=select_autoescape(['html', 'xml']),
+            auto_reload=False,
+            cache_size=-1
+        )
+
+        self.template = self.env.get_template('digest_email.html')
+
+        # The plain text template shares loader and cache; it is never escaped,
+        # and block tags on their own line are dropped so the template mirrors
+        # the output line by line
+        self.text_env = self.env.overlay(
+            autoescape=False,
+            trim_blocks=True,
+            lstrip_blocks=True
         )
+        self.text_template = self.text_env.get_template('digest_email.txt')
 
-        logger.info(f"EmailBuilder initialized with template directory: {template_dir}")
+        # Quiet days only differ in the date; render that digest once around a
+        # placeholder so build_plain_text_fallback can skip the template
+        self._empty_text_parts = self.text_template.render(
+            date='\0',
+            jira_updates={},
+            confluence_pages=[],
+            total_jira=0
+        ).split('\0')
 
-    def build_digest(self, jira_updates: Dict, confluence_pages: List[Dict]) -> str:
+        logger.info("EmailBuilder initialized with template directory: %s", template_dir)
+
+    @staticmethod
+    def _current_date() -> str:
+        """Format the current time as shown in the digest header."""
+        return datetime.now().strftime('%d.%m.%Y %H:%M Uhr')
+
+    def build_digest(self, jira_updates: Dict, confluence_pages: List[Dict], date: Optional[str] = None) -> str:
         """
         Build the HTML digest email from collected data.
 
         Args:
             jira_updates: Dictionary containing Jira updates (new_tickets, status_changes, etc.)
             confluence_pages: List of updated Confluence pages
+            date: Formatted digest date (defaults to the current time)
 
         Returns:
             HTML string ready to be sent as email
         """
         try:
-            template = self.env.get_template('digest_email.html')
-
-            current_date = datetime.now().strftime('%d.%m.%Y %H:%M Uhr')
-
-            html_content = template.render(
-                date=current_date,
+            html_content = self.template.render(
+                date=date or self._current_date(),
                 jira_updates=jira_updates,
                 confluence_pages=confluence_pages
             )
@@ -47,85 +77,76 @@ class EmailBuilder:
             return html_content
 
         except Exception as e:
-            logger.error(f"Error building email content: {e}")
+            logger.error("Error building email content: %s", e)
             raise
 
-    def build_plain_text_fallback(self, jira_updates: Dict, confluence_pages: List[Dict]) -> str:
+    def build_plain_text_fallback(
+        self,
+        jira_updates: Dict,
+        confluence_pages: List[Dict],
+        date: Optional[str] = None
+    ) -> str:
         """
         Build a plain text version of the digest as fallback.
 
         Args:
             jira_updates: Dictionary containing Jira updates
             confluence_pages: List of updated Confluence pages
+            date: Formatted digest date (defaults to the current time)
 
         Returns:
             Plain text string
         """
-        lines = []
-        lines.append("=" * 60)
-        lines.append("TÄGLICHER JIRA & CONFLUENCE DIGEST")
-        lines.append("=" * 60)
-        lines.append(f"Datum: {datetime.now().strftime('%d.%m.%Y %H:%M Uhr')}")
-        lines.append("")
-
-        lines.append("CONFLUENCE UPDATES")
-        lines.append("-" * 60)
-        if confluence_pages:
-            lines.append(f"{len(confluence_pages)} Seite(n) wurden aktualisiert:")
-            lines.append("")
-            for page in confluence_pages:
-                lines.append(f"  - {page['title']}")
-                lines.append(f"    Space: {page['space_name']}")
-                lines.append(f"    Von: {page['last_updated_by']}")
-                lines.append(f"    URL: {page['url']}")
-                lines.append("")
-        else:
-            lines.append("Keine Confluence-Updates.")
-        lines.append("")
-
-        lines.append("JIRA UPDATES")
-        lines.append("-" * 60)
-
-        total = sum(len(v) for v in jira_updates.values())
-        if total > 0:
-            lines.append(f"{total} Jira-Aktivität(en):")
-            lines.append("")
-
-            if jira_updates.get('new_tickets'):
-                lines.append(f"NEUE TICKETS ({len(jira_updates['new_tickets'])})")
-                for ticket in jira_updates['new_tickets']:
-                    lines.append(f"  - {ticket['key']}: {ticket['summary']}")
-                    lines.append(f"    Projekt: {ticket['project']} | Status: {ticket['status']}")
-                    lines.append(f"    URL: {ticket['url']}")
-                    lines.append("")
-
-            if jira_updates.get('status_changes'):
-                lines.append(f"STATUS-ÄNDERUNGEN ({len(jira_updates['status_changes'])})")
-                for ticket in jira_updates['status_changes']:
-                    lines.append(f"  - {ticket['key']}: {ticket['summary']}")
-                    for change in ticket['status_changes']:
-                        lines.append(f"    {change['from']} → {change['to']}")
-                    lines.append("")
-
-            if jira_updates.get('assignment_changes'):
-                lines.append(f"ZUWEISUNGEN ({len(jira_updates['assignment_changes'])})")
-                for ticket in jira_updates['assignment_changes']:
-                    lines.append(f"  - {ticket['key']}: {ticket['summary']}")
-                    for change in ticket['assignment_changes']:
-                        lines.append(f"    {change['from']} → {change['to']}")
-                    lines.append("")
-
-            if jira_updates.get('new_comments'):
-                lines.append(f"NEUE KOMMENTARE ({len(jira_updates['new_comments'])})")
-                for ticket in jira_updates['new_comments']:
-                    lines.append(f"  - {ticket['key']}: {ticket['summary']}")
-                    for comment in ticket['comments']:
-                        lines.append(f"    {comment['author']}: {comment['body'][:100]}...")
-                    lines.append("")
-        else:
-            lines.append("Keine Jira-Updates.")
-
-        lines.append("")
-        lines.append("=" * 60)
-
-        return "\n".join(lines)
+        total_jira = sum(map(len, jira_updates.values()))
+        date = date or self._current_date()
+
+        if total_jira == 0 and not confluence_pages:
+            return date.join(self._empty_text_parts)
+
+        context = {
+            'date': date,
+            'jira_updates': jira_updates,
+            'confluence_pages': confluence_pages,
+            'total_jira': total_jira
+        }
+
+        if total_jira + len(confluence_pages) <= LARGE_DIGEST_ITEMS:
+            return self.text_template.render(context)
+
+        # render() keeps every output chunk alive until the final join; large
+        # digests are written into a single buffer as they are generated instead
+        buffer = io.StringIO()
+        self.text_template.stream(context).dump(buffer)
+        return buffer.getvalue()
+
+    def build_both(self, jira_updates: Dict, confluence_pages: List[Dict]) -> Tuple[str, str]:
+        """
+        Build the HTML digest and its plain text fallback with the same timestamp.
+
+        Args:
+            jira_updates: Dictionary containing Jira updates
+            confluence_pages: List of updated Confluence pages
+
+        Returns:
+            Tuple of (HTML string, plain text string)
+        """
+        current_date = self._current_date()
+
+        return (
+            self.build_digest(jira_updates, confluence_pages, date=current_date),
+            self.build_plain_text_fallback(jira_updates, confluence_pages, date=current_date)
+        )
+
+
+@functools.lru_cache(maxsize=1)
+def get_email_builder() -> EmailBuilder:
+    """
+    Return the process-wide EmailBuilder.
+
+    Prefer this over instantiating EmailBuilder directly so the Jinja2
+    environment and its compiled templates are shared by all callers.
+
+    Returns:
+        Shared EmailBuilder instance
+    """
+    return EmailBuilder()
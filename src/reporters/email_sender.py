@@ -1,12 +1,67 @@
+import asyncio
 import logging
+import random
 import smtplib
+import socket
+import threading
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
-from typing import Optional
+from email.utils import getaddresses
+from typing import List, Optional
 import time
 
+import aiosmtplib
+
 logger = logging.getLogger(__name__)
 
+# Concurrent SMTP connections opened by send_email_async
+ASYNC_POOL_SIZE = 4
+
+# Upper bound for the delay between send attempts, in seconds
+MAX_BACKOFF = 30
+
+# Seconds a resolved SMTP server address is reused before resolving it again
+DNS_CACHE_TTL = 300
+
+
+def _backoff_delay(attempt: int) -> float:
+    """Exponential backoff with jitter so retries from concurrent sends spread out."""
+    return min(MAX_BACKOFF, 2 ** attempt + random.uniform(0, 1))
+
+
+def _envelope_recipients(header_values: List[str]) -> List[str]:
+    """Extract the bare addresses from To-style header values, as send_message does."""
+    return [address for _, address in getaddresses(header_values) if address]
+
+
+class _ResolvedSMTP(smtplib.SMTP):
+    """
+    SMTP client that opens its socket to pre-resolved server addresses.
+
+    Addresses are tried in order until one accepts the connection, like
+    socket.create_connection does for a hostname. connect() still records the
+    real hostname, which STARTTLS uses for SNI and certificate verification.
+    """
+
+    resolved_addresses: List[str] = []
+
+    def _get_socket(self, host, port, timeout):
+        if not self.resolved_addresses:
+            return super()._get_socket(host, port, timeout)
+
+        error = None
+        for address in self.resolved_addresses:
+            try:
+                return super()._get_socket(address, port, timeout)
+            except OSError as e:
+                error = e
+
+        raise error
+
+
+class _ResolvedSMTP_SSL(smtplib.SMTP_SSL, _ResolvedSMTP):
+    """Implicit TLS variant; SMTP_SSL wraps the socket using the real hostname."""
+
 
 class EmailSender:
     """Sends emails via SMTP."""
@@ -20,15 +75,156 @@ class EmailSender:
             smtp_port: SMTP server port
             username: SMTP username (usually the sender email)
             password: SMTP password or app password
-            recipient: Default recipient email address
+            recipient: Default recipient email address, or several separated by commas
         """
         self.smtp_host = smtp_host
         self.smtp_port = smtp_port
         self.username = username
         self.password = password
         self.recipient = recipient
+        self.recipients = _envelope_recipients([recipient])
+
+        # Port 465 uses implicit TLS; otherwise STARTTLS support is probed on
+        # the first connection and remembered for this (host, port)
+        self._use_ssl = smtp_port == 465
+        self._use_starttls: Optional[bool] = None
+
+        # Server address and EHLO name are looked up once instead of per connection
+        self._resolved_addresses: List[str] = []
+        self._resolved_at = 0.0
+        self._local_hostname: Optional[str] = None
+
+        # Authenticated connection reused across sends; smtplib is not thread-safe
+        self._smtp: Optional[smtplib.SMTP] = None
+        self._lock = threading.Lock()
+
+        logger.info("EmailSender initialized for %s:%d", smtp_host, smtp_port)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def _connect(self, timeout: int) -> smtplib.SMTP:
+        """Open a new SMTP connection, secure it with TLS if available and log in."""
+        smtp_class = _ResolvedSMTP_SSL if self._use_ssl else _ResolvedSMTP
+        server = smtp_class(local_hostname=self._local_hostname, timeout=timeout)
+        self._local_hostname = server.local_hostname
+        server.resolved_addresses = self._resolve_host()
+
+        if logger.isEnabledFor(logging.DEBUG):
+            server.set_debuglevel(1)
+
+        try:
+            code, message = server.connect(self.smtp_host, self.smtp_port)
+        except OSError:
+            # The cached address may be stale, e.g. after a server failover
+            self._resolved_addresses = []
+            server.close()
+            raise
+
+        try:
+            if code != 220:
+                raise smtplib.SMTPConnectError(code, message)
+
+            if not self._use_ssl:
+                if self._use_starttls is None:
+                    server.ehlo()
+                    self._use_starttls = server.has_extn('STARTTLS')
+
+                if self._use_starttls:
+                    # starttls() and login() send EHLO themselves when needed
+                    logger.info("Starting TLS encryption")
+                    server.starttls()
+
+            logger.info("Logging in as %s", self.username)
+            server.login(self.username, self.password)
+
+        except Exception:
+            server.close()
+            raise
+
+        return server
+
+    def _resolve_host(self) -> List[str]:
+        """Return the cached server addresses, resolving them again once DNS_CACHE_TTL has passed."""
+        now = time.monotonic()
+
+        if not self._resolved_addresses or now - self._resolved_at > DNS_CACHE_TTL:
+            try:
+                addresses = socket.getaddrinfo(self.smtp_host, self.smtp_port, type=socket.SOCK_STREAM)
+            except OSError as e:
+                # Let the connection attempt resolve the hostname and report the error
+                logger.warning("Could not resolve SMTP host %s: %s", self.smtp_host, e)
+                return []
+
+            # Keep getaddrinfo's order so connections fall back like create_connection
+            self._resolved_addresses = list(dict.fromkeys(info[4][0] for info in addresses))
+            self._resolved_at = now
+
+        return self._resolved_addresses
+
+    def _get_connection(self) -> smtplib.SMTP:
+        """Return the cached connection if it still answers NOOP, otherwise reconnect."""
+        if self._smtp is not None:
+            try:
+                if self._smtp.noop()[0] == 250:
+                    return self._smtp
+            except (smtplib.SMTPException, OSError):
+                pass
+
+            self._discard_connection()
+
+        logger.info("Connecting to SMTP server %s:%d", self.smtp_host, self.smtp_port)
+        self._smtp = self._connect(timeout=30)
+        return self._smtp
+
+    def _discard_connection(self):
+        """Drop the cached connection without a QUIT handshake."""
+        if self._smtp is not None:
+            try:
+                self._smtp.close()
+            except OSError:
+                pass
+            self._smtp = None
+
+    def close(self):
+        """Close the cached SMTP connection, if any."""
+        with self._lock:
+            if self._smtp is not None:
+                try:
+                    self._smtp.quit()
+                except (smtplib.SMTPException, OSError):
+                    pass
+                self._discard_connection()
+
+    def _build_parts(self, html_content: str, plain_text_content: Optional[str]) -> List[MIMEText]:
+        """
+        Build the body parts of the digest.
+
+        utf-8 MIMEText bodies are base64-encoded once, on construction, so the
+        parts can be shared by every message built from them.
+        """
+        parts = []
+
+        if plain_text_content:
+            parts.append(MIMEText(plain_text_content, 'plain', 'utf-8'))
+
+        parts.append(MIMEText(html_content, 'html', 'utf-8'))
+        return parts
+
+    def _build_message(self, parts: List[MIMEText], subject: str, recipient_email: str) -> bytes:
+        """Wrap the encoded body parts in a multipart message and flatten it with SMTP line endings."""
+        msg = MIMEMultipart('alternative')
+        msg['Subject'] = subject
+        msg['From'] = self.username
+        msg['To'] = recipient_email
+
+        for part in parts:
+            msg.attach(part)
 
-        logger.info(f"EmailSender initialized for {smtp_host}:{smtp_port}")
+        return msg.as_bytes(policy=msg.policy.clone(linesep='\r\n'))
 
     def send_email(
         self,
@@ -36,84 +232,203 @@ class EmailSender:
         subject: str,
         plain_text_content: Optional[str] = None,
         recipient: Optional[str] = None,
-        max_retries: int = 3
+        max_retries: int = 3,
+        recipients: Optional[List[str]] = None
     ) -> bool:
         """
         Send an email with HTML content and plain text fallback.
 
+        All recipients receive the same message in a single SMTP transaction.
+
         Args:
             html_content: HTML email body
             subject: Email subject
             plain_text_content: Plain text fallback (optional)
             recipient: Override default recipient (optional)
             max_retries: Number of retry attempts on failure
+            recipients: Override default recipients with several addresses (optional)
 
         Returns:
             True if email was sent successfully, False otherwise
         """
-        recipient_email = recipient or self.recipient
+        to_header = ', '.join(recipients) if recipients else (recipient or self.recipient)
+        recipient_emails = _envelope_recipients([to_header])
+        recipient_email = ', '.join(recipient_emails)
 
-        for attempt in range(1, max_retries + 1):
-            try:
-                msg = MIMEMultipart('alternative')
-                msg['Subject'] = subject
-                msg['From'] = self.username
-                msg['To'] = recipient_email
+        # Flatten once; retries resend the same bytes
+        parts = self._build_parts(html_content, plain_text_content)
+        msg_bytes = self._build_message(parts, subject, to_header)
 
-                if plain_text_content:
-                    part1 = MIMEText(plain_text_content, 'plain', 'utf-8')
-                    msg.attach(part1)
+        reconnected = False
 
-                part2 = MIMEText(html_content, 'html', 'utf-8')
-                msg.attach(part2)
+        with self._lock:
+            for attempt in range(1, max_retries + 1):
+                try:
+                    logger.info("Sending email to %s (Attempt %d/%d)", recipient_email, attempt, max_retries)
 
-                logger.info(f"Connecting to SMTP server {self.smtp_host}:{self.smtp_port} (Attempt {attempt}/{max_retries})")
+                    server = self._get_connection()
+                    refused = server.sendmail(self.username, recipient_emails, msg_bytes)
+                    if refused:
+                        logger.warning("Recipients refused by the server: %s", ', '.join(refused))
 
-                with smtplib.SMTP(self.smtp_host, self.smtp_port, timeout=30) as server:
-                    server.set_debuglevel(0)
-                    server.ehlo()
+                    logger.info("Email sent successfully to %s", recipient_email)
+                    return True
 
-                    if server.has_extn('STARTTLS'):
-                        logger.info("Starting TLS encryption")
-                        server.starttls()
-                        server.ehlo()
+                except smtplib.SMTPAuthenticationError as e:
+                    self._discard_connection()
+                    logger.error("SMTP Authentication failed: %s", e)
+                    logger.error("Please check your username and password. For Gmail, use an App Password.")
+                    return False
 
-                    logger.info(f"Logging in as {self.username}")
-                    server.login(self.username, self.password)
+                except smtplib.SMTPException as e:
+                    self._discard_connection()
+                    disconnected = isinstance(e, smtplib.SMTPServerDisconnected)
+                    logger.error("SMTP error on attempt %d/%d: %s", attempt, max_retries, e)
 
-                    logger.info(f"Sending email to {recipient_email}")
-                    server.send_message(msg)
+                except Exception as e:
+                    self._discard_connection()
+                    disconnected = False
+                    logger.error("Unexpected error sending email on attempt %d/%d: %s", attempt, max_retries, e)
 
-                logger.info(f"Email sent successfully to {recipient_email}")
+                if attempt == max_retries:
+                    logger.error("Max retries reached. Email not sent.")
+                    return False
+
+                if disconnected and not reconnected:
+                    # Usually an idle connection dropped by the server, not overload
+                    reconnected = True
+                    logger.info("Reconnecting immediately...")
+                    continue
+
+                wait_time = _backoff_delay(attempt)
+                logger.info("Retrying in %.1f seconds...", wait_time)
+                time.sleep(wait_time)
+
+        return False
+
+    async def _connect_async(self) -> aiosmtplib.SMTP:
+        """Open an asyncio SMTP connection, upgrading to TLS if available, and log in."""
+        smtp = aiosmtplib.SMTP(
+            hostname=self.smtp_host,
+            port=self.smtp_port,
+            username=self.username,
+            password=self.password,
+            use_tls=self._use_ssl,
+            # None upgrades with STARTTLS whenever the server offers it
+            start_tls=False if self._use_ssl else None,
+            timeout=30
+        )
+        await smtp.connect()
+        return smtp
+
+    async def _send_one_async(
+        self,
+        pool: asyncio.Queue,
+        msg_bytes: bytes,
+        recipient_email: str,
+        max_retries: int
+    ) -> bool:
+        """Send one message over a pooled connection, reconnecting on failure."""
+        reconnected = False
+
+        for attempt in range(1, max_retries + 1):
+            smtp = await pool.get()
+            try:
+                if smtp is None:
+                    smtp = await self._connect_async()
+
+                logger.info("Sending email to %s (Attempt %d/%d)", recipient_email, attempt, max_retries)
+                await smtp.sendmail(self.username, [recipient_email], msg_bytes)
+
+                logger.info("Email sent successfully to %s", recipient_email)
                 return True
 
-            except smtplib.SMTPAuthenticationError as e:
-                logger.error(f"SMTP Authentication failed: {e}")
+            except aiosmtplib.SMTPAuthenticationError as e:
+                logger.error("SMTP Authentication failed: %s", e)
                 logger.error("Please check your username and password. For Gmail, use an App Password.")
                 return False
 
-            except smtplib.SMTPException as e:
-                logger.error(f"SMTP error on attempt {attempt}/{max_retries}: {e}")
-                if attempt < max_retries:
-                    wait_time = attempt * 2
-                    logger.info(f"Retrying in {wait_time} seconds...")
-                    time.sleep(wait_time)
-                else:
-                    logger.error("Max retries reached. Email not sent.")
-                    return False
-
             except Exception as e:
-                logger.error(f"Unexpected error sending email on attempt {attempt}/{max_retries}: {e}")
-                if attempt < max_retries:
-                    wait_time = attempt * 2
-                    logger.info(f"Retrying in {wait_time} seconds...")
-                    time.sleep(wait_time)
-                else:
-                    logger.error("Max retries reached. Email not sent.")
-                    return False
+                if smtp is not None:
+                    smtp.close()
+                    smtp = None
+                disconnected = isinstance(e, aiosmtplib.SMTPServerDisconnected)
+                logger.error("SMTP error sending to %s on attempt %d/%d: %s", recipient_email, attempt, max_retries, e)
+
+            finally:
+                # Hand the slot back before backing off so other sends can use it
+                pool.put_nowait(smtp)
+
+            if attempt == max_retries:
+                logger.error("Max retries reached. Email to %s not sent.", recipient_email)
+                return False
+
+            if disconnected and not reconnected:
+                reconnected = True
+                logger.info("Reconnecting immediately...")
+                continue
+
+            wait_time = _backoff_delay(attempt)
+            logger.info("Retrying in %.1f seconds...", wait_time)
+            await asyncio.sleep(wait_time)
 
         return False
 
+    async def send_email_async(
+        self,
+        html_content: str,
+        subject: str,
+        plain_text_content: Optional[str] = None,
+        recipients: Optional[List[str]] = None,
+        max_retries: int = 3
+    ) -> bool:
+        """
+        Send the email to several recipients concurrently.
+
+        Each recipient gets an individually addressed message. Sends share a
+        pool of up to ASYNC_POOL_SIZE authenticated connections that are
+        opened on first use and closed once all sends have finished.
+
+        Args:
+            html_content: HTML email body
+            subject: Email subject
+            plain_text_content: Plain text fallback (optional)
+            recipients: Recipient email addresses (defaults to the default recipients)
+            max_retries: Number of retry attempts per recipient on failure
+
+        Returns:
+            True if the email was sent to every recipient, False otherwise
+        """
+        recipient_emails = _envelope_recipients(recipients) if recipients else self.recipients
+
+        # Bodies are encoded once; only the headers differ per recipient
+        parts = self._build_parts(html_content, plain_text_content)
+
+        pool: asyncio.Queue = asyncio.Queue()
+        for _ in range(min(ASYNC_POOL_SIZE, len(recipient_emails))):
+            pool.put_nowait(None)
+
+        try:
+            results = await asyncio.gather(*(
+                self._send_one_async(
+                    pool,
+                    self._build_message(parts, subject, recipient_email),
+                    recipient_email,
+                    max_retries
+                )
+                for recipient_email in recipient_emails
+            ))
+        finally:
+            while not pool.empty():
+                smtp = pool.get_nowait()
+                if smtp is not None:
+                    try:
+                        await smtp.quit()
+                    except (aiosmtplib.SMTPException, OSError):
+                        smtp.close()
+
+        return all(results)
+
     def test_connection(self) -> bool:
         """
         Test SMTP connection and authentication.
@@ -122,25 +437,18 @@ class EmailSender:
             True if connection successful, False otherwise
         """
         try:
-            logger.info(f"Testing SMTP connection to {self.smtp_host}:{self.smtp_port}")
-
-            with smtplib.SMTP(self.smtp_host, self.smtp_port, timeout=10) as server:
-                server.set_debuglevel(0)
-                server.ehlo()
-
-                if server.has_extn('STARTTLS'):
-                    server.starttls()
-                    server.ehlo()
+            logger.info("Testing SMTP connection to %s:%d", self.smtp_host, self.smtp_port)
 
-                server.login(self.username, self.password)
+            with self._connect(timeout=10):
+                pass
 
             logger.info("SMTP connection test successful")
             return True
 
         except smtplib.SMTPAuthenticationError as e:
-            logger.error(f"SMTP Authentication test failed: {e}")
+            logger.error("SMTP Authentication test failed: %s", e)
             return False
 
         except Exception as e:
-            logger.error(f"SMTP connection test failed: {e}")
+            logger.error("SMTP connection test failed: %s", e)
             return False